@@ -28,4 +28,31 @@ DEFAULT_GENERATOR_MODEL = os.getenv("DEFAULT_GENERATOR_MODEL")
 DEFAULT_REASONING_MODEL = os.getenv("DEFAULT_REASONING_MODEL") 
 
 # 支持的文件类型
-SUPPORTED_FILE_TYPES = ["txt", "pdf", "doc", "docx", "md", "json", "csv", "xlsx"]
\ No newline at end of file
+SUPPORTED_FILE_TYPES = ["txt", "pdf", "doc", "docx", "md", "json", "csv", "xlsx"]
+
+# 制品生成过程文件配置
+# 流式生成时过程文件(generation_process.txt)的刷新间隔（秒），用于控制实时预览的延迟
+ARTIFACT_PROCESS_FLUSH_INTERVAL = float(os.getenv("DATAMIND_PROCESS_FLUSH_INTERVAL", "0.25"))
+# 设置为1时不写入过程文件，生产环境无人查看过程文件时可关闭
+ARTIFACT_DISABLE_PROCESS_LOG = os.getenv("DATAMIND_DISABLE_PROCESS_LOG", "0") == "1"
+# 设置为1时也为错误页面生成截图；错误页面截图很少被查看，默认跳过以节省一次浏览器渲染
+ARTIFACT_ERROR_SCREENSHOT = os.getenv("DATAMIND_ERROR_SCREENSHOT", "0") == "1"
+# 启动截图用Chromium时追加的命令行参数（空格分隔），例如容器中以root运行时可追加"--no-sandbox"
+ARTIFACT_CHROME_EXTRA_ARGS = os.getenv("DATAMIND_CHROME_EXTRA_ARGS", "").split()
+# 截图图片格式（jpeg或png）与JPEG质量；截图只用作画廊缩略图，默认使用编码更快、体积更小的JPEG
+ARTIFACT_SCREENSHOT_FORMAT = os.getenv("DATAMIND_SCREENSHOT_FORMAT", "jpeg").lower()
+ARTIFACT_SCREENSHOT_QUALITY = int(os.getenv("DATAMIND_SCREENSHOT_QUALITY", "80"))
+# 截图页面加载超时时间（毫秒），超时后重试一次，仍失败则放弃本次截图
+ARTIFACT_SCREENSHOT_NAV_TIMEOUT_MS = int(os.getenv("DATAMIND_SCREENSHOT_NAV_TIMEOUT_MS", "5000"))
+# 设置为1时截图使用精简模式：拦截音视频、字体以及允许列表以外主机的网络请求，减少页面加载等待
+ARTIFACT_SCREENSHOT_LITE = os.getenv("DATAMIND_SCREENSHOT_LITE", "0") == "1"
+# 精简模式下仍允许访问的主机（逗号分隔），默认放行常用的前端库CDN，保证图表等脚本正常渲染
+ARTIFACT_SCREENSHOT_ALLOW_HOSTS = [
+    host.strip() for host in os.getenv(
+        "DATAMIND_SCREENSHOT_ALLOW_HOSTS",
+        "cdn.jsdelivr.net,cdnjs.cloudflare.com,unpkg.com,cdn.tailwindcss.com"
+    ).split(",") if host.strip()
+]
+# 默认保留Playwright每次API调用时的inspect.stack()调用栈采集；设置为0时在启动截图用Playwright前跳过该采集以降低调用开销，
+# 替换作用于进程内所有Playwright调用，出错信息中将不再包含"Page.goto:"等API名称前缀
+ARTIFACT_PW_INSPECT_STACK = os.getenv("DATAMIND_PW_INSPECT", "1") == "1"
@@ -1,7 +1,10 @@
-import json
+import hashlib
+import inspect
+import io
 import logging
+import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import traceback
 from .reasoningLLM import ReasoningLLMEngine
@@ -10,15 +13,202 @@ from ..config.settings import (
     DEFAULT_REASONING_MODEL,
     DEFAULT_GENERATOR_MODEL,
     DEFAULT_LLM_API_KEY,
-    DEFAULT_LLM_API_BASE
+    DEFAULT_LLM_API_BASE,
+    ARTIFACT_PROCESS_FLUSH_INTERVAL,
+    ARTIFACT_DISABLE_PROCESS_LOG,
+    ARTIFACT_ERROR_SCREENSHOT,
+    ARTIFACT_CHROME_EXTRA_ARGS,
+    ARTIFACT_SCREENSHOT_FORMAT,
+    ARTIFACT_SCREENSHOT_QUALITY,
+    ARTIFACT_SCREENSHOT_NAV_TIMEOUT_MS,
+    ARTIFACT_SCREENSHOT_LITE,
+    ARTIFACT_SCREENSHOT_ALLOW_HOSTS,
+    ARTIFACT_PW_INSPECT_STACK
 )
 import re
+import sys
+import time
 from .context_preparation import prepare_context_files
 from ..prompts import load_prompt, format_prompt
-import os
-from dotenv import load_dotenv
+from ..utils.json_io import dump_json, dumps_json, load_json, link_or_copy_atomic, write_bytes_atomic
 import asyncio
-from playwright.async_api import async_playwright
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+# 响应开头的空白字符
+_LEADING_WHITESPACE_RE = re.compile(r'\s*')
+# 代码块起始标记（按优先级排列）
+_CODE_BLOCK_MARKERS = ("```html", "```HTML", "```")
+# 代码块结束标记
+_CODE_FENCE = "```"
+# 第一个HTML标签（跳过<!DOCTYPE>和注释）
+_FIRST_TAG_RE = re.compile(r'<(?!!)([a-z]+)[^>]*>')
+# 完整HTML文档的起始标记（大小写两种写法），以这些标记开头的内容无需再做标签检查
+_HTML_DOCUMENT_PREFIXES = ('<!DOCTYPE html>', '<!doctype html>', '<html', '<HTML')
+
+
+def _has_closed_tag_pair(content: str) -> bool:
+    """判断内容中是否存在成对的HTML标签（如<div ...>...</div>）
+    
+    逐个向前扫描开始标签，用str.find查找对应的结束标签；某个结束标签在某处之后不存在时，
+    在更靠后的位置也不可能存在，记录下来不再重复查找，避免正则回溯带来的二次方扫描。
+    与正则 <([a-z]+)[^>]*>.*?</\1> 的匹配结果一致（包括标签名回溯到较短前缀的情况）
+    
+    Args:
+        content: 待检查的文本
+        
+    Returns:
+        bool: 是否存在成对的标签
+    """
+    missing_closings = set()
+    tag_match = _FIRST_TAG_RE.search(content)
+    while tag_match:
+        name = tag_match.group(1)
+        for name_len in range(len(name), 0, -1):
+            closing = f"</{name[:name_len]}>"
+            if closing in missing_closings:
+                continue
+            if content.find(closing, tag_match.end()) >= 0:
+                return True
+            missing_closings.add(closing)
+        tag_match = _FIRST_TAG_RE.search(content, tag_match.start() + 1)
+    return False
+
+
+# 流式生成HTML时提前结束的标记序列：进入<answer>后，出现</html>并随后出现代码块结束标记即可停止
+_HTML_STOP_MARKERS = ("<answer>", "</html>", "```")
+# 跨chunk保留的尾部长度，保证被切分在两个chunk之间的标记也能识别
+_STOP_MARKER_CARRY = max(len(marker) for marker in _HTML_STOP_MARKERS) - 1
+# 建议查询响应中答案部分的起止标签
+_ANSWER_OPEN = "<answer>"
+_ANSWER_CLOSE = "</answer>"
+
+
+def _make_dirs(dir_paths) -> None:
+    """依次创建目录（parents=True），供asyncio.to_thread在工作线程中批量执行"""
+    for dir_path in dir_paths:
+        dir_path.mkdir(parents=True, exist_ok=True)
+
+
+def _write_bytes_and_stat(path: Path, data: bytes) -> Tuple[int, int]:
+    """原子地写入文件并返回写入后的(st_mtime_ns, st_size)，供asyncio.to_thread在工作线程中执行"""
+    write_bytes_atomic(path, data)
+    file_stat = os.stat(path)
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+def _advance_html_stop_scan(state: int, tail: str, chunk: str):
+    """按顺序在流式输出中查找_HTML_STOP_MARKERS
+    
+    Args:
+        state: 已找到的标记数量
+        tail: 上一个chunk保留的尾部文本
+        chunk: 新的chunk
+        
+    Returns:
+        Tuple[int, str]: (新的已找到标记数量, 需要保留到下一个chunk的尾部文本)
+    """
+    window = tail + chunk
+    pos = 0
+    while state < len(_HTML_STOP_MARKERS):
+        marker = _HTML_STOP_MARKERS[state]
+        idx = window.find(marker, pos)
+        if idx < 0:
+            break
+        pos = idx + len(marker)
+        state += 1
+    return state, window[max(pos, len(window) - _STOP_MARKER_CARRY):]
+
+
+# 错误页面模板在导入时加载，并按{{title}}、{{error_message}}占位符预先切分为静态片段
+_ERROR_HTML_HEAD, _error_html_rest = load_prompt("artifact/error_html_template").split("{{title}}", 1)
+_ERROR_HTML_MIDDLE, _ERROR_HTML_TAIL = _error_html_rest.split("{{error_message}}", 1)
+del _error_html_rest
+
+# 截图视口大小，与gallery.html中卡片的比例相匹配
+SCREENSHOT_VIEWPORT = {"width": 600, "height": 400}
+# 截图上下文的固定参数：固定视口与设备像素比，屏蔽缩略图用不到的Service Worker
+SCREENSHOT_CONTEXT_OPTIONS = {
+    "viewport": SCREENSHOT_VIEWPORT,
+    "device_scale_factor": 1,
+    "service_workers": "block",
+}
+# 截图图片格式对应的文件扩展名；生成制品时按ARTIFACT_SCREENSHOT_FORMAT选择，无法识别时使用PNG
+_SCREENSHOT_SUFFIXES = {"jpeg": ".jpg", "png": ".png"}
+SCREENSHOT_SUFFIX = _SCREENSHOT_SUFFIXES.get(ARTIFACT_SCREENSHOT_FORMAT, ".png")
+# 截图用Chromium的启动参数：关闭截图用不到的GPU、扩展、后台网络等功能，缩短启动时间并降低内存占用
+CHROME_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--no-first-run",
+    "--hide-scrollbars",
+    "--mute-audio",
+    "--disable-renderer-backgrounding",
+]
+# 截图前等待Web字体加载完成的最长时间（秒），超时后直接截图
+FONTS_READY_TIMEOUT = 2
+
+
+async def _abort_image_request(route) -> None:
+    """不加载图片的截图上下文使用的请求路由：拦截图片请求，其余请求照常发出"""
+    if route.request.resource_type == "image":
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# 精简截图模式下一律拦截的资源类型
+_LITE_BLOCKED_RESOURCE_TYPES = frozenset({"media", "font"})
+
+
+def _should_block_request(request, allow_hosts) -> bool:
+    """判断精简截图模式下是否拦截该请求
+    
+    Args:
+        request: Playwright请求对象
+        allow_hosts: 允许访问的主机集合
+        
+    Returns:
+        bool: 音视频、字体以及允许列表以外主机的http(s)请求返回True；本地文件、data URL等不拦截
+    """
+    if request.resource_type in _LITE_BLOCKED_RESOURCE_TYPES:
+        return True
+    url = request.url
+    if not url.startswith(("http://", "https://")):
+        return False
+    return urlsplit(url).hostname not in allow_hosts
+
+
+class _InspectWithoutStack:
+    """inspect模块的代理，只将stack()替换为返回空列表，其余属性转发给inspect"""
+    
+    @staticmethod
+    def stack(context: int = 1) -> list:
+        return []
+    
+    def __getattr__(self, name):
+        return getattr(inspect, name)
+
+
+def _patch_playwright_inspect() -> None:
+    """让Playwright跳过每次API调用时的inspect.stack()
+    
+    Playwright在每次API调用时用inspect.stack()采集完整调用栈，仅用于错误信息和trace中的调用位置，
+    截图时的多次调用中这部分开销占比很高。替换作用于进程内所有Playwright调用，之后出错信息中不再包含
+    调用方位置和API名称前缀，因此默认不启用，仅在设置DATAMIND_PW_INSPECT=0时于启动Playwright前替换
+    """
+    try:
+        from playwright._impl import _connection
+    except ImportError:
+        return
+    # 只在目标模块确实直接引用inspect时替换，其他版本的Playwright保持不变
+    if getattr(_connection, "inspect", None) is inspect:
+        _connection.inspect = _InspectWithoutStack()
+
 
 class ArtifactGenerator:
     """制品生成器，用于根据上下文文件生成HTML格式的制品"""
@@ -47,10 +237,31 @@ class ArtifactGenerator:
         self.artifacts_dir = self.artifacts_base 
         self.iterations_dir = self.alchemy_dir / "iterations"  # 存放迭代版本
         
-        # 创建所需目录
-        for dir_path in [self.artifacts_base, self.artifacts_dir, self.iterations_dir]:
+        # 创建所需目录（artifacts_dir与artifacts_base是同一目录，只需创建一次）
+        for dir_path in [self.artifacts_dir, self.iterations_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
         
+        # 迭代号缓存：(iterations目录修改时间, 迭代号)
+        self._iteration_cache = None
+        
+        # status.json内容缓存，首次读取后在内存中更新，每轮生成结束时写回；
+        # 同时记录缓存对应的文件(st_mtime_ns, st_size)，文件被其他组件改写后重新读取
+        self.status_path = self.artifacts_dir / "status.json"
+        self._status_info: Optional[Dict] = None
+        self._status_file_key: Optional[Tuple[int, int]] = None
+        
+        # Playwright实例（及其驱动进程）与浏览器实例，首次截图时启动，之后各次截图复用，调用aclose()释放；
+        # 每次截图只创建独立的BrowserContext
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        # 精简截图模式（ARTIFACT_SCREENSHOT_LITE）下允许访问的主机
+        self.screenshot_allow_hosts = set(ARTIFACT_SCREENSHOT_ALLOW_HOSTS)
+        # 截图页面加载与各项操作的超时时间（毫秒）
+        self.screenshot_nav_timeout_ms = ARTIFACT_SCREENSHOT_NAV_TIMEOUT_MS
+        # 截图时是否执行页面脚本；制品只包含静态HTML/CSS时可设为False，省去脚本引擎的初始化和执行
+        self.screenshot_java_script_enabled = True
+        
         # 设置日志记录器
         self.logger = logger
 
@@ -76,11 +287,49 @@ class ArtifactGenerator:
         # 创建推理引擎实例
         self.reasoning_engine = self._setup_reasoning_engine()
         self.logger.info(f"已创建推理引擎实例，使用默认推理模型")    
+        
+        # 优化建议查询使用独立的推理引擎，与HTML生成并发执行时互不干扰对话历史
+        self.suggestion_engine = self._setup_reasoning_engine()
+        
+        # 推理引擎在生成器生命周期内不变，生成配置只需计算一次
+        self._generation_config = {
+            "engine": self.reasoning_engine.__class__.__name__,
+            "model": getattr(self.reasoning_engine, 'model_name', 'unknown')
+        }
 
     def _setup_reasoning_engine(self):
         """初始化推理引擎"""
         return ReasoningLLMEngine(self.model_manager, model_name=DEFAULT_REASONING_MODEL)
        
+    def _get_status_info(self) -> Optional[Dict]:
+        """获取status.json内容，按文件修改时间和大小缓存
+        
+        文件自上次读取或写入后未变化时直接返回内存中的内容，只有被其他组件（如DataMindAlchemy）改写后才重新解析
+        
+        Returns:
+            Optional[Dict]: 状态信息，文件不存在或读取失败时返回None（已有缓存时返回缓存）
+        """
+        try:
+            file_stat = os.stat(self.status_path)
+        except OSError:
+            return self._status_info
+        file_key = (file_stat.st_mtime_ns, file_stat.st_size)
+        if self._status_info is None or file_key != self._status_file_key:
+            try:
+                self._status_info = load_json(self.status_path)
+                self._status_file_key = file_key
+            except Exception as e:
+                self.logger.warning(f"读取status.json失败: {str(e)}")
+        return self._status_info
+
+    async def _save_status_info(self) -> None:
+        """将内存中的状态信息写回status.json
+        
+        序列化在事件循环线程中完成（状态字典只在这里被修改），文件写入放到工作线程
+        """
+        data = dumps_json(self._status_info)
+        self._status_file_key = await asyncio.to_thread(_write_bytes_and_stat, self.status_path, data)
+
     def _generate_error_html(self, error_message: str, title: str) -> str:
         """生成错误提示页面
         
@@ -91,10 +340,8 @@ class ArtifactGenerator:
         Returns:
             str: 错误页面HTML内容
         """
-        # 加载错误HTML模板并替换占位符
-        return format_prompt("artifact/error_html_template", 
-                            error_message=error_message,
-                            title=title)
+        # 使用导入时预先切分好的错误页面模板，只拼接标题和错误信息
+        return "".join((_ERROR_HTML_HEAD, title, _ERROR_HTML_MIDDLE, error_message, _ERROR_HTML_TAIL))
 
     def _extract_html_content(self, full_response: str) -> Optional[str]:
         """从响应中提取HTML内容
@@ -107,47 +354,42 @@ class ArtifactGenerator:
         """
         try:
             # 如果响应为空，直接返回None
-            if not full_response or not full_response.strip():
+            if not full_response or full_response.isspace():
                 return None
                 
-            # 1. 如果响应本身就是完整的HTML
-            if full_response.strip().startswith('<!DOCTYPE html>') or full_response.strip().startswith('<html'):
-                return full_response.strip()
+            # 1. 如果响应本身就是完整的HTML（通过跳过前导空白的位置判断前缀，避免复制整个响应）
+            content_start = _LEADING_WHITESPACE_RE.match(full_response).end()
+            if full_response.startswith(_HTML_DOCUMENT_PREFIXES, content_start):
+                return full_response[content_start:].rstrip()
             
-            # 2. 尝试提取html代码块 - 改进提取逻辑，确保只获取代码部分
-            html_markers = ["```html", "```HTML", "```"]
-            start_marker = None
-            
-            for marker in html_markers:
-                if marker in full_response:
-                    start_marker = marker
+            # 2. 尝试提取html代码块 - 按标记优先级用str.find定位代码块起点，
+            #    跳过标记后的空白，再从该处查找结束标记，全程只做线性的字符串查找
+            for marker in _CODE_BLOCK_MARKERS:
+                start_idx = full_response.find(marker)
+                if start_idx < 0:
+                    continue
+
+                body_start = _LEADING_WHITESPACE_RE.match(full_response, start_idx + len(marker)).end()
+                end_idx = full_response.find(_CODE_FENCE, body_start)
+                if end_idx < 0:
                     break
-            
-            if start_marker:
-                # 查找代码块的边界
-                parts = full_response.split(start_marker, 1)
-                if len(parts) > 1:
-                    remaining_text = parts[1].lstrip()
-                    
-                    # 查找结束标记
-                    end_marker = "```"
-                    if end_marker in remaining_text:
-                        code_part = remaining_text.split(end_marker, 1)[0].strip()
-                        
-                        # 如果代码块的第一行是语言标识符，去掉它
-                        if code_part.startswith('html') or code_part.startswith('HTML'):
-                            code_part = code_part[4:].lstrip()
-                        
-                        if code_part and (code_part.startswith('<!DOCTYPE html>') or code_part.startswith('<html')):
-                            return code_part
-                        elif code_part:
-                            # 检查是否包含有效的HTML标签
-                            if re.search(r'<(?!!)([a-z]+)[^>]*>.*?</\1>', code_part, re.DOTALL):
-                                # 移除可能的前导注释或非HTML内容
-                                first_tag_match = re.search(r'<(?!!)([a-z]+)[^>]*>', code_part)
-                                if first_tag_match:
-                                    code_part = code_part[first_tag_match.start():]
-                                return code_part
+                code_part = full_response[body_start:end_idx].strip()
+
+                # 如果代码块的第一行是语言标识符，去掉它
+                if code_part.startswith('html') or code_part.startswith('HTML'):
+                    code_part = code_part[4:].lstrip()
+
+                if code_part.startswith(_HTML_DOCUMENT_PREFIXES):
+                    return code_part
+                elif code_part:
+                    # 检查是否包含有效的HTML标签
+                    if _has_closed_tag_pair(code_part):
+                        # 移除可能的前导注释或非HTML内容
+                        first_tag_match = _FIRST_TAG_RE.search(code_part)
+                        if first_tag_match:
+                            code_part = code_part[first_tag_match.start():]
+                        return code_part
+                break
             
             return None
         
@@ -156,20 +398,37 @@ class ArtifactGenerator:
             return None
 
     def _get_next_iteration(self) -> int:
-        """获取下一个迭代版本号"""
-        if not self.iterations_dir.exists():
+        """获取当前迭代版本号（iterations目录下已存在的最大迭代号）
+
+        DataMindAlchemy会在调用generate_artifact之前创建本轮的iterN目录，因此这里返回的
+        是已存在的最新迭代号而不是加1后的值。
+        扫描结果按iterations目录的修改时间缓存，目录内容未变化时直接返回缓存值
+        """
+        try:
+            dir_mtime = self.iterations_dir.stat().st_mtime_ns
+        except FileNotFoundError:
             return 1
+
+        if self._iteration_cache is not None and self._iteration_cache[0] == dir_mtime:
+            return self._iteration_cache[1]
             
-        existing_iterations = [int(v.name.split('iter')[-1]) 
-                             for v in self.iterations_dir.glob("iter*") 
-                             if v.name.startswith('iter')]
-        return max(existing_iterations, default=0)
+        # 使用os.scandir直接读取目录项名称，不为每一项构造Path对象
+        with os.scandir(self.iterations_dir) as entries:
+            existing_iterations = [int(entry.name.split('iter')[-1])
+                                   for entry in entries
+                                   if entry.name.startswith('iter')]
+        iteration = max(existing_iterations, default=0)
+        self._iteration_cache = (dir_mtime, iteration)
+        return iteration
 
     async def _collect_stream_response(self, 
                                  temperature=0.7, 
                                  max_tokens=30000,
                                  metadata=None, 
-                                 process_path=None):
+                                 process_path=None,
+                                 stop_after_html=False,
+                                 engine=None,
+                                 echo=True):
         """收集流式响应并显示
         
         Args:
@@ -177,29 +436,69 @@ class ArtifactGenerator:
             max_tokens: 最大令牌数
             metadata: 元数据字典
             process_path: 可选，保存生成过程的文件路径
+            stop_after_html: 是否在回答中的HTML代码块（</html>之后的```）结束后立即停止接收
+            engine: 可选，使用的推理引擎，默认为self.reasoning_engine
+            echo: 是否在控制台显示流式输出内容
             
         Returns:
             str: 收集到的完整响应
         """
-        full_response = ""
-        
-        async for chunk in self.reasoning_engine.get_stream_response(
+        # 使用StringIO累积响应，避免字符串反复拼接
+        response_buffer = io.StringIO()
+
+        # 整个流式过程只打开一次过程文件，由缓冲区合并写入，避免每个chunk都打开/关闭文件
+        if ARTIFACT_DISABLE_PROCESS_LOG:
+            process_path = None
+        process_file = process_path.open("a", encoding="utf-8", buffering=65536) if process_path else None
+        # 按时间间隔刷新过程文件和控制台输出，保证实时预览的同时限制系统调用次数
+        last_flush = time.monotonic()
+        # 控制台输出先在内存中累积，每个刷新间隔只写一次标准输出（行缓冲的终端遇到换行就会写入）
+        echo_parts = []
+        stop_state, stop_tail = 0, ""
+        stream = (engine or self.reasoning_engine).get_stream_response(
             temperature=temperature,
             max_tokens=max_tokens,
             metadata=metadata or {}
-        ):
-            if chunk:
-                full_response += chunk
-                
-                # 如果提供了文件路径，保存生成过程
-                if process_path:
-                    with process_path.open("a", encoding="utf-8") as f:
-                        f.write(chunk)
-                
-                # 显示流式输出内容
-                print(f"\r{chunk}", end='', flush=True)
-                
-        return full_response
+        )
+        try:
+            async for chunk in stream:
+                if chunk:
+                    response_buffer.write(chunk)
+
+                    # 如果提供了文件路径，保存生成过程
+                    if process_file:
+                        process_file.write(chunk)
+
+                    # 显示流式输出内容（只累积增量，由下方按时间间隔统一输出）
+                    if echo:
+                        echo_parts.append(f"\r{chunk}")
+
+                    now = time.monotonic()
+                    if now - last_flush >= ARTIFACT_PROCESS_FLUSH_INTERVAL:
+                        if echo_parts:
+                            sys.stdout.write("".join(echo_parts))
+                            echo_parts.clear()
+                        sys.stdout.flush()
+                        if process_file:
+                            # 真正落盘的刷新放到工作线程执行，慢速磁盘/网络文件系统不会阻塞事件循环
+                            await asyncio.to_thread(process_file.flush)
+                        last_flush = now
+
+                    # HTML代码块已完整输出，之后的说明文字不会被提取，提前结束以节省生成时间
+                    if stop_after_html:
+                        stop_state, stop_tail = _advance_html_stop_scan(stop_state, stop_tail, chunk)
+                        if stop_state == len(_HTML_STOP_MARKERS):
+                            self.logger.info("HTML代码块已生成完毕，提前结束流式响应")
+                            break
+        finally:
+            await stream.aclose()
+            if echo_parts:
+                sys.stdout.write("".join(echo_parts))
+            sys.stdout.flush()
+            if process_file:
+                process_file.close()
+
+        return response_buffer.getvalue()
 
     def _build_html_prompt(self, context_files: Dict[str, str], query: str) -> str:
         """构建HTML生成的提示词
@@ -211,37 +510,41 @@ class ArtifactGenerator:
         Returns:
             str: 生成提示词
         """
-        # 将文件内容格式化为字符串
-        context_files_str = ""
-        for filename, content in context_files.items():
-            context_files_str += f"\n[file name]: {filename}\n[file content begin]\n{content}\n[file content end]\n"
+        # 先在较小的模板上替换query，再在{{context_files}}处切分模板，
+        # 文件内容直接作为片段参与最终的一次性拼接，避免对整个提示词多次复制和扫描
+        template = format_prompt("artifact/html_prompt", query=query)
+        head, tail = template.split("{{context_files}}", 1)
         
-        # 加载提示词模板并替换占位符
-        return format_prompt("artifact/html_prompt",
-                            context_files=context_files_str,
-                            query=query)
+        prompt_parts = [head]
+        for filename, content in context_files.items():
+            prompt_parts.append(f"\n[file name]: {filename}\n[file content begin]\n{content}\n[file content end]\n")
+        prompt_parts.append(tail)
+        return "".join(prompt_parts)
 
     async def generate_artifact(self, 
                               search_results_files: List[str], 
                               output_name: str,
-                              query: str) -> Optional[Path]:
+                              query: str,
+                              render_hints: Optional[Dict[str, bool]] = None) -> Optional[Path]:
         """生成HTML制品
         
         Args:
             search_results_files: 搜索结果文件路径列表
             output_name: 输出文件名
             query: 用户的查询内容
+            render_hints: 可选，截图渲染选项：{"js": 是否执行页面脚本, "images": 是否加载图片}；
+                制品为纯静态页面时关闭对应项可以加快截图
             
         Returns:
             Optional[Path]: 生成的HTML文件路径，如果生成失败返回None
         """
+        iteration = None
         try:
             if not self.reasoning_engine:
                 raise ValueError("未配置推理引擎，无法生成内容")
                 
             # 检查status.json文件是否存在，不存在则创建
-            status_file = self.artifacts_dir / "status.json"
-            if not status_file.exists():
+            if await asyncio.to_thread(self._get_status_info) is None:
                 self.logger.info("status.json文件不存在，正在创建初始文件...")
                 
                 # 使用self.alchemy_id作为artifact_id
@@ -261,49 +564,54 @@ class ArtifactGenerator:
                     "iterations": []
                 }
                 
-                status_file.parent.mkdir(parents=True, exist_ok=True)
-                with open(status_file, 'w', encoding='utf-8') as f:
-                    json.dump(initial_status, f, ensure_ascii=False, indent=2)
+                self._status_info = initial_status
+                await self._save_status_info()
                 self.logger.info(f"status.json文件已创建，artifact_id: {self.alchemy_id}")
 
             # 确定生成目录
             iteration = self._get_next_iteration()
             
             # 生成HTML
-            return await self._generate_html(search_results_files, output_name, query, iteration)
+            return await self._generate_html(search_results_files, output_name, query, iteration,
+                                             render_hints=render_hints)
                 
         except Exception as e:
-            self.logger.error(f"生成HTML制品时发生错误: {str(e)}")
+            # 只格式化一次调用栈，日志与错误记录文件共用
+            error_traceback = traceback.format_exc()
+            self.logger.error(f"生成HTML制品时发生错误: {str(e)}\n{error_traceback}")
             
-            # 错误处理和记录
+            # 错误处理和记录（在确定迭代号之前就出错时，重新获取当前迭代号）
+            if iteration is None:
+                iteration = self._get_next_iteration()
             work_base = self.iterations_dir / f"iter{iteration}" / "artifact"
             process_dir = work_base / "process"
             output_dir = work_base / "output"
             
-            # 确保目录存在
-            for dir_path in [work_base, process_dir, output_dir]:
-                dir_path.mkdir(parents=True, exist_ok=True)
-                
             error_info = {
                 "timestamp": datetime.now().isoformat(),
                 "status": "error",
                 "error": str(e),
                 "query": query,
-                "traceback": traceback.format_exc()
+                "traceback": error_traceback
             }
             
-            with open(process_dir / "generation_error.json", "w", encoding="utf-8") as f:
-                json.dump(error_info, f, ensure_ascii=False, indent=2)
+            # 确保目录存在（子目录以parents=True创建，会一并创建work_base）
+            await asyncio.to_thread(_make_dirs, (process_dir, output_dir))
+            
+            await asyncio.to_thread(dump_json, process_dir / "generation_error.json", error_info)
             
             error_html = self._generate_error_html(str(e), query)
             error_path = output_dir / f"{output_name}_error.html"
-            error_path.write_text(error_html, encoding="utf-8")
+            await asyncio.to_thread(error_path.write_text, error_html, encoding="utf-8")
             
-            # 尝试为错误页面生成截图
-            try:
-                await self._generate_screenshot(error_path, output_dir / f"{output_name}_error.png")
-            except Exception as screenshot_error:
-                self.logger.error(f"为错误页面生成截图时发生错误: {str(screenshot_error)}")
+            # 尝试为错误页面生成截图（默认跳过，见ARTIFACT_ERROR_SCREENSHOT）
+            if ARTIFACT_ERROR_SCREENSHOT:
+                try:
+                    await self._generate_screenshot_from_html(
+                        error_html, output_dir / f"{output_name}_error{SCREENSHOT_SUFFIX}", render_hints
+                    )
+                except Exception as screenshot_error:
+                    self.logger.error(f"为错误页面生成截图时发生错误: {str(screenshot_error)}")
             
             return None
 
@@ -311,7 +619,9 @@ class ArtifactGenerator:
                         search_results_files: List[str], 
                         output_name: str,
                         query: str,
-                        iteration: int) -> Optional[Path]:
+                        iteration: int,
+                        with_screenshot: bool = True,
+                        render_hints: Optional[Dict[str, bool]] = None) -> Optional[Path]:
         """生成HTML
         
         Args:
@@ -319,10 +629,13 @@ class ArtifactGenerator:
             output_name: 输出文件名
             query: 用户的查询内容
             iteration: 迭代次数
+            with_screenshot: 是否使用Playwright为生成的HTML截图
+            render_hints: 可选，截图渲染选项，见generate_artifact
             
         Returns:
             Optional[Path]: 生成的HTML文件路径，如果生成失败返回None
         """
+        optimization_task = None
         try:
             # 确定生成目录
             work_base = self.iterations_dir / f"iter{iteration}" / "artifact"
@@ -333,41 +646,39 @@ class ArtifactGenerator:
             output_dir = work_base / "output"      # 最终输出
             context_dir = work_base / "context"    # 上下文文件副本
             
-            for dir_path in [work_base, process_dir, output_dir, context_dir]:
-                dir_path.mkdir(parents=True, exist_ok=True)
+            # 子目录以parents=True创建，会一并创建work_base（在工作线程中批量创建）
+            await asyncio.to_thread(_make_dirs, (process_dir, output_dir, context_dir))
+
+            # 优化建议查询只依赖status.json，与上下文准备和HTML生成互不依赖，提前在后台并发执行
+            optimization_task = asyncio.create_task(self._get_optimization_query())
 
-            # 将上下文文件复制到工作目录，并收集内容信息
-            context_contents, context_files_info = prepare_context_files(search_results_files, context_dir, work_base, self.logger)
+            # 将上下文文件复制到工作目录，并收集内容信息（在工作线程中执行，不阻塞事件循环）
+            context_contents, context_files_info = await asyncio.to_thread(
+                prepare_context_files, search_results_files, context_dir, work_base, self.logger
+            )
                 
             if not context_contents:
                 raise ValueError("未能成功读取任何上下文文件内容")
 
-            # 获取优化建议查询
-            optimization_suggestion = await self._get_optimization_query()
-
-            # 更新元数据结构
+            # 更新元数据结构（时间戳记录开始生成HTML的时间；优化建议查询仍在并发执行，完成后再补充）
             metadata_info = {
                 "artifact_id": f"artifact_{self.alchemy_id}",
                 "type": "html",
                 "timestamp": datetime.now().isoformat(),
                 "query": query,
-                "optimization_suggestion": optimization_suggestion,
+                "optimization_suggestion": None,
                 "output_name": output_name,
                 "context_files": context_files_info,
-                "generation_config": {
-                    "engine": self.reasoning_engine.__class__.__name__,
-                    "model": getattr(self.reasoning_engine, 'model_name', 'unknown')
-                }
+                "generation_config": dict(self._generation_config)
             }
 
-            # 保存元数据
-            with open(work_base / "metadata.json", "w", encoding="utf-8") as f:
-                json.dump(metadata_info, f, ensure_ascii=False, indent=2)
+            # 在开始生成前保存元数据，生成失败时本轮迭代也留有请求记录
+            metadata_path = work_base / "metadata.json"
+            await asyncio.to_thread(dump_json, metadata_path, metadata_info)
 
             # 构建HTML提示词
             html_prompt = self._build_html_prompt(context_contents, query)
-            with open(process_dir / "html_prompt.md", "w", encoding="utf-8") as f:
-                f.write(html_prompt)
+            await asyncio.to_thread((process_dir / "html_prompt.md").write_text, html_prompt, encoding="utf-8")
 
             # 在添加新消息前清除历史对话记录
             self.reasoning_engine.clear_history()
@@ -379,17 +690,27 @@ class ArtifactGenerator:
             full_response = await self._collect_stream_response(
                 temperature=0.7,
                 metadata={'stage': 'html_generation'},
-                process_path=process_dir / "generation_process.txt"
+                process_path=process_dir / "generation_process.txt",
+                stop_after_html=True
             )
             
+            # 获取并发执行的优化建议查询结果，补充到元数据中
+            optimization_suggestion = await optimization_task
+            if optimization_suggestion is not None:
+                metadata_info["optimization_suggestion"] = optimization_suggestion
+                await asyncio.to_thread(dump_json, metadata_path, metadata_info)
+            
             if not full_response:
                 raise ValueError("生成内容为空")
             
             # 提取最终的HTML内容
             html_content = self._extract_html_content(full_response)
             
+            # 提取失败时写入的是错误页面，默认不再为其截图
+            take_screenshot = with_screenshot
             if not html_content:
                 self.logger.warning("无法从响应中提取有效的HTML内容，将生成错误页面")
+                take_screenshot = with_screenshot and ARTIFACT_ERROR_SCREENSHOT
                 html_content = self._generate_error_html(
                     "无法从AI响应中提取有效的HTML内容",
                     query
@@ -397,68 +718,77 @@ class ArtifactGenerator:
             
             # 保存迭代版本HTML文件
             output_path = output_dir / f"{artifact_name}.html"
-            output_path.write_text(html_content, encoding="utf-8")
+            html_bytes = html_content.encode("utf-8")
+            await asyncio.to_thread(output_path.write_bytes, html_bytes)
 
             # 保存artifact.html
             artifact_path = self.artifacts_dir / "artifact.html"
             
-            # 写入artifact.html
-            artifact_path.write_text(html_content, encoding="utf-8")
+            # 将迭代版本硬链接为artifact.html（不支持时复制），不再重复写入HTML内容；
+            # 通过临时文件原子替换，避免其他读取方看到写了一半的页面
+            await asyncio.to_thread(link_or_copy_atomic, output_path, artifact_path)
             self.logger.info(f"已保存制品HTML: {artifact_path}")
             
-            # 使用Playwright生成HTML文件的截图
-            await self._generate_screenshot(output_path, output_dir / f"{artifact_name}.png")
+            # 使用Playwright生成HTML文件的截图（HTML与上一轮完全相同时复用上一轮的截图）
+            screenshot_path = output_dir / f"{artifact_name}{SCREENSHOT_SUFFIX}"
+            html_hash = hashlib.blake2b(html_bytes, digest_size=16).hexdigest()
+            # 截图结果同时取决于渲染选项，解析后的选项与HTML哈希一起作为复用截图的依据
+            render_hints = self._resolve_render_hints(render_hints)
+            screenshot_ok = False
+            if take_screenshot:
+                screenshot_ok = await self._reuse_or_generate_screenshot(
+                    html_content, screenshot_path, html_hash, render_hints
+                )
+            
+            # 本轮生成结果的各项记录共用同一个完成时间戳和相对路径字符串
+            now_iso = datetime.now().isoformat()
+            rel_output = str(output_path.relative_to(self.alchemy_dir))
+            rel_screenshot = str(screenshot_path.relative_to(self.alchemy_dir))
             
             # 保存本轮生成的完整信息
             generation_info = {
                 "iteration": iteration,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
                 "input_query": query,
-                "output_file": str(output_path.relative_to(self.alchemy_dir)),
-                "output_screenshot": str((output_dir / f"{artifact_name}.png").relative_to(self.alchemy_dir)),
+                "output_file": rel_output,
+                "output_screenshot": rel_screenshot,
                 "optimization_suggestion": optimization_suggestion,
                 "generation_stats": {
                     "html_size": len(html_content)
                 }
             }
+            if not take_screenshot:
+                del generation_info["output_screenshot"]
             
-            with open(output_dir / "generation_info.json", "w", encoding="utf-8") as f:
-                json.dump(generation_info, f, ensure_ascii=False, indent=2)
+            await asyncio.to_thread(dump_json, output_dir / "generation_info.json", generation_info)
 
 
             # 更新status.json
-            # 先检查status.json是否已存在，如果存在则读取现有内容
-            status_path = self.artifacts_dir / "status.json"
-            if status_path.exists():
-                try:
-                    with open(status_path, "r", encoding="utf-8") as f:
-                        status_info = json.load(f)
-                    # 更新必要字段，保留其他现有信息
-                    status_info.update({
-                        "updated_at": datetime.now().isoformat(),
-                        "latest_iteration": iteration,
-                    })
-                    # 确保原始查询存在
-                    if "original_query" not in status_info:
-                        status_info["original_query"] = query
-                except Exception as e:
-                    self.logger.warning(f"读取现有status.json失败: {str(e)}，将创建新文件")
-                    status_info = None
-            
-            # 如果status.json不存在或读取失败，则创建新的status_info
-            if not status_path.exists() or status_info is None:
+            # 直接在内存中的状态信息上更新，保留其他现有信息
+            status_info = self._get_status_info()
+            if status_info is not None:
+                status_info.update({
+                    "updated_at": now_iso,
+                    "latest_iteration": iteration,
+                })
+                # 确保原始查询存在
+                if "original_query" not in status_info:
+                    status_info["original_query"] = query
+            else:
+                # 如果status.json不存在或读取失败，则创建新的status_info
                 status_info = {
                     "artifact_id": f"artifact_{self.alchemy_id}",
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
                     "latest_iteration": iteration,
                     "original_query": query,
                     "artifact": {
                         "path": "artifact.html",
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": now_iso
                     },
                     "iterations": []
                 }
+                self._status_info = status_info
                        
             # 确保iterations字段存在
             if "iterations" not in status_info:
@@ -468,28 +798,41 @@ class ArtifactGenerator:
             # 更新迭代信息
             iteration_info = {
                 "iteration": iteration,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
                 "path": str(work_base.relative_to(self.alchemy_dir)),
                 "query": query,
                 "type": "html",
-                "output": str(output_path.relative_to(self.alchemy_dir)),
-                "screenshot": str((output_dir / f"{artifact_name}.png").relative_to(self.alchemy_dir)),
+                "output": rel_output,
+                "screenshot": rel_screenshot,
                 "optimization_suggestion": optimization_suggestion
             }
+            if not take_screenshot:
+                del iteration_info["screenshot"]
 
             status_info["iterations"].append(iteration_info)
             
-            with open(status_path, "w", encoding="utf-8") as f:
-                json.dump(status_info, f, ensure_ascii=False, indent=2)
+            # 记录最新HTML的哈希、渲染选项与截图，供下一轮判断能否复用截图
+            if screenshot_ok:
+                status_info.setdefault("artifact", {}).update({
+                    "html_hash": html_hash,
+                    "render_js": render_hints["js"],
+                    "render_images": render_hints["images"],
+                    "screenshot": rel_screenshot
+                })
+            
+            await self._save_status_info()
 
 
 
             return output_path
 
         except Exception as e:
-            self.logger.error(f"生成HTML时发生错误: {str(e)}")
-            traceback.print_exc()
+            self.logger.error(f"生成HTML时发生错误: {str(e)}", exc_info=True)
             return None 
+        finally:
+            # 生成失败提前退出时取消仍在运行的优化建议查询
+            if optimization_task is not None and not optimization_task.done():
+                optimization_task.cancel()
 
     async def _get_optimization_query(self) -> Optional[str]:
         """根据原始查询，生成新的建议查询
@@ -498,37 +841,29 @@ class ArtifactGenerator:
             Optional[str]: 新的建议查询语句
         """
         try:
-            # 从status.json中读取原始查询
+            # 从status.json中读取原始查询（只读取解析一次，原始查询与历史查询共用同一份结果）
             original_query = ""
-            status_path = self.artifacts_dir / "status.json"
+            status_info = self._get_status_info()
             
-            if status_path.exists():
-                try:
-                    with open(status_path, "r", encoding="utf-8") as f:
-                        status_info = json.load(f)
-                    original_query = status_info.get("original_query", "")
-                    self.logger.info(f"从status.json中读取到原始查询: {original_query}")
-                except Exception as e:
-                    self.logger.error(f"读取status.json时发生错误: {str(e)}")
+            if status_info is not None:
+                # 缺少original_query字段时回退到第一次迭代的查询
+                original_query = (
+                    status_info.get("original_query")
+                    or (status_info.get("iterations") or [{}])[0].get("query", "")
+                )
+                self.logger.info(f"从status.json中读取到原始查询: {original_query}")
                         
             if not original_query:
                 self.logger.warning("无法获取原始查询，将使用空字符串")
             
 
             #获取前面迭代已经生成过的查询
-            # 先检查status.json是否已存在，如果存在则读取现有内容
-            status_path = self.artifacts_dir / "status.json"
-            if status_path.exists():
-                try:
-                    with open(status_path, "r", encoding="utf-8") as f:
-                        status_info = json.load(f)
-                        previous_queries = [
-                            iteration_info.get("query", "")
-                            for iteration_info in status_info.get("iterations", [])
-                        ]
-                        self.logger.info(f"前面迭代已经生成过的查询: {previous_queries}")
-                except Exception as e:
-                    self.logger.error(f"读取status.json时发生错误: {str(e)}")
+            if status_info is not None:
+                previous_queries = [
+                    iteration_info.get("query", "")
+                    for iteration_info in status_info.get("iterations", [])
+                ]
+                self.logger.info(f"前面迭代已经生成过的查询: {previous_queries}")
             else:
                 self.logger.warning("无法获取前面迭代已经生成过的查询，将使用空列表")
                 previous_queries = []
@@ -544,24 +879,26 @@ class ArtifactGenerator:
             )
             
             # 在添加新消息前清除历史对话记录
-            self.reasoning_engine.clear_history()
+            self.suggestion_engine.clear_history()
             
             # 添加用户消息
-            self.reasoning_engine.add_message("user", prompt)
+            self.suggestion_engine.add_message("user", prompt)
             
-            # 使用流式输出收集响应
+            # 使用流式输出收集响应（与HTML生成并发执行，不在控制台显示以免输出交错）
             full_response = await self._collect_stream_response(
                 temperature=0.7,
                 metadata={'stage': 'optimization_suggestion'},
-                process_path=None
+                process_path=None,
+                engine=self.suggestion_engine,
+                echo=False
             )
             
             # 从full_response中提取<answer></answer>标签之间的内容
-            if "<answer>" in full_response and "</answer>" in full_response:
-                start_idx = full_response.find("<answer>") + len("<answer>")
-                end_idx = full_response.find("</answer>")
-                if start_idx < end_idx:
-                    suggestion = full_response[start_idx:end_idx].strip()
+            _, answer_open, answer_rest = full_response.partition(_ANSWER_OPEN)
+            answer_body, answer_close, _ = answer_rest.partition(_ANSWER_CLOSE)
+            if answer_open and answer_close:
+                suggestion = answer_body.strip()
+                if suggestion:
                     self.logger.info(f"最终建议查询: {suggestion}")
                     return suggestion
             else:
@@ -577,260 +914,265 @@ class ArtifactGenerator:
             self.logger.error(f"生成建议查询时发生错误: {str(e)}")
             return None
 
-    async def _take_screenshot(self, url: str, output_path: Path) -> bool:
-        """使用Playwright截图
+    async def _get_browser(self):
+        """获取复用的Chromium浏览器实例，未启动或已断开时重新启动
+        
+        Returns:
+            Browser: Playwright浏览器实例
+        """
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    if not ARTIFACT_PW_INSPECT_STACK:
+                        _patch_playwright_inspect()
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=True,
+                    args=CHROME_ARGS + ARTIFACT_CHROME_EXTRA_ARGS
+                )
+                self.logger.info("已启动Chromium浏览器实例")
+            return self._browser
+
+    async def warmup(self) -> bool:
+        """预先启动Playwright与复用的浏览器，使首次截图不再承担冷启动开销
         
-        Args:
-            url: 网页URL
-            output_path: 输出截图文件路径
-            
         Returns:
-            bool: 是否成功截图
+            bool: 浏览器是否启动成功
         """
         try:
-            async def screenshot(playwright):
-                browser = await playwright.chromium.launch()
-                page = await browser.new_page()
-                await page.goto(url)
-                await page.screenshot(path=str(output_path))
-                await browser.close()
-
-            async with async_playwright() as playwright:
-                await screenshot(playwright)
-            return True
+            await self._get_browser()
         except Exception as e:
-            self.logger.error(f"截图失败: {str(e)}")
+            self.logger.warning(f"预热截图浏览器失败: {str(e)}")
             return False
+        return True
 
-    async def _generate_html_with_screenshot(self, 
-                        search_results_files: List[str], 
-                        output_name: str,
-                        query: str,
-                        iteration: int) -> Optional[Path]:
-        """生成HTML并截图
+    def _resolve_render_hints(self, render_hints: Optional[Dict[str, bool]] = None) -> Dict[str, bool]:
+        """补全截图渲染选项中未指定的项
         
         Args:
-            search_results_files: 搜索结果文件路径列表
-            output_name: 输出文件名
-            query: 用户的查询内容
-            iteration: 迭代次数
+            render_hints: 可选，渲染选项：{"js": 是否执行页面脚本, "images": 是否加载图片}
             
         Returns:
-            Optional[Path]: 生成的HTML文件路径，如果生成失败返回None
+            Dict[str, bool]: 完整的渲染选项，js默认使用screenshot_java_script_enabled，images默认为True
         """
-        try:
-            # 确定生成目录
-            work_base = self.iterations_dir / f"iter{iteration}" / "artifact"
-            artifact_name = f"artifact_iter{iteration}"
-            
-            # 创建工作目录
-            process_dir = work_base / "process"    # 生成过程
-            output_dir = work_base / "output"      # 最终输出
-            context_dir = work_base / "context"    # 上下文文件副本
-            
-            for dir_path in [work_base, process_dir, output_dir, context_dir]:
-                dir_path.mkdir(parents=True, exist_ok=True)
+        render_hints = render_hints or {}
+        return {
+            "js": render_hints.get("js", self.screenshot_java_script_enabled),
+            "images": render_hints.get("images", True)
+        }
 
-            # 将上下文文件复制到工作目录，并收集内容信息
-            context_contents, context_files_info = prepare_context_files(search_results_files, context_dir, work_base, self.logger)
-                
-            if not context_contents:
-                raise ValueError("未能成功读取任何上下文文件内容")
-
-            # 获取优化建议查询
-            optimization_suggestion = await self._get_optimization_query()
-
-            # 更新元数据结构
-            metadata_info = {
-                "artifact_id": f"artifact_{self.alchemy_id}",
-                "type": "html",
-                "timestamp": datetime.now().isoformat(),
-                "query": query,
-                "optimization_suggestion": optimization_suggestion,
-                "output_name": output_name,
-                "context_files": context_files_info,
-                "generation_config": {
-                    "engine": self.reasoning_engine.__class__.__name__,
-                    "model": getattr(self.reasoning_engine, 'model_name', 'unknown')
-                }
-            }
+    @asynccontextmanager
+    async def _screenshot_context(self, render_hints: Optional[Dict[str, bool]] = None):
+        """在复用的浏览器中新建一个用于截图的BrowserContext，退出时关闭
+        
+        Args:
+            render_hints: 可选，渲染选项：{"js": 是否执行页面脚本, "images": 是否加载图片}，
+                未指定的项分别使用screenshot_java_script_enabled和True
+        
+        Yields:
+            BrowserContext: 按SCREENSHOT_CONTEXT_OPTIONS及渲染选项配置的浏览器上下文
+        """
+        render_hints = self._resolve_render_hints(render_hints)
+        browser = await self._get_browser()
+        context = await self._new_screenshot_context(browser, render_hints["js"], render_hints["images"])
+        try:
+            yield context
+        finally:
+            await context.close()
 
-            # 保存元数据
-            with open(work_base / "metadata.json", "w", encoding="utf-8") as f:
-                json.dump(metadata_info, f, ensure_ascii=False, indent=2)
+    async def _new_screenshot_context(self, browser, java_script_enabled: bool, load_images: bool):
+        """按渲染选项创建截图用的浏览器上下文
+        
+        Args:
+            browser: 浏览器实例
+            java_script_enabled: 是否执行页面脚本
+            load_images: 是否加载图片；为False时在上下文上安装一次拦截图片请求的路由
+            
+        Returns:
+            BrowserContext: 新建的浏览器上下文
+        """
+        context = await browser.new_context(
+            **SCREENSHOT_CONTEXT_OPTIONS,
+            java_script_enabled=java_script_enabled
+        )
+        if not load_images:
+            await context.route("**/*", _abort_image_request)
+        return context
 
-            # 构建HTML提示词
-            html_prompt = self._build_html_prompt(context_contents, query)
-            with open(process_dir / "html_prompt.md", "w", encoding="utf-8") as f:
-                f.write(html_prompt)
+    async def aclose(self) -> None:
+        """关闭复用的浏览器实例并停止Playwright驱动进程，须在事件循环关闭前调用"""
+        async with self._browser_lock:
+            try:
+                if self._browser is not None:
+                    await self._browser.close()
+            except Exception as e:
+                self.logger.warning(f"关闭浏览器时发生错误: {str(e)}")
+            finally:
+                self._browser = None
+            try:
+                if self._playwright is not None:
+                    await self._playwright.stop()
+            except Exception as e:
+                self.logger.warning(f"停止Playwright时发生错误: {str(e)}")
+            finally:
+                self._playwright = None
 
-            # 在添加新消息前清除历史对话记录
-            self.reasoning_engine.clear_history()
-            
-            # 添加用户消息
-            self.reasoning_engine.add_message("user", html_prompt)
-            
-            # 收集生成的内容
-            full_response = await self._collect_stream_response(
-                temperature=0.7,
-                metadata={'stage': 'html_generation'},
-                process_path=process_dir / "generation_process.txt"
-            )
-            
-            if not full_response:
-                raise ValueError("生成内容为空")
-            
-            # 提取最终的HTML内容
-            html_content = self._extract_html_content(full_response)
-            
-            if not html_content:
-                self.logger.warning("无法从响应中提取有效的HTML内容，将生成错误页面")
-                html_content = self._generate_error_html(
-                    "无法从AI响应中提取有效的HTML内容",
-                    query
-                )
+    async def _reuse_or_generate_screenshot(self,
+                                            html_content: str,
+                                            screenshot_path: Path,
+                                            html_hash: str,
+                                            render_hints: Optional[Dict[str, bool]] = None) -> bool:
+        """HTML与渲染选项均与上一轮相同时链接上一轮的截图，否则使用Playwright截图
+        
+        Args:
+            html_content: HTML内容
+            screenshot_path: 截图保存路径
+            html_hash: HTML内容哈希
+            render_hints: 可选，渲染选项，见_screenshot_context
             
-            # 保存迭代版本HTML文件
-            output_path = output_dir / f"{artifact_name}.html"
-            output_path.write_text(html_content, encoding="utf-8")
+        Returns:
+            bool: 截图是否成功
+        """
+        render_hints = self._resolve_render_hints(render_hints)
+        previous = (self._get_status_info() or {}).get("artifact", {})
+        if (previous.get("html_hash") == html_hash and previous.get("screenshot")
+                and previous.get("render_js") == render_hints["js"]
+                and previous.get("render_images") == render_hints["images"]
+                and Path(previous["screenshot"]).suffix == screenshot_path.suffix):
+            previous_screenshot = self.alchemy_dir / previous["screenshot"]
+            try:
+                await asyncio.to_thread(link_or_copy_atomic, previous_screenshot, screenshot_path)
+                self.logger.info("HTML内容未变化，复用上一轮截图: %s", previous_screenshot)
+                return True
+            except OSError as e:
+                self.logger.warning(f"复用上一轮截图失败，将重新截图: {str(e)}")
+        
+        return await self._generate_screenshot_from_html(html_content, screenshot_path, render_hints)
 
-            # 保存artifact.html
-            artifact_path = self.artifacts_dir / "artifact.html"
-            
-            # 写入artifact.html
-            artifact_path.write_text(html_content, encoding="utf-8")
-            self.logger.info(f"已保存制品HTML: {artifact_path}")
-            
-            # 保存本轮生成的完整信息
-            generation_info = {
-                "iteration": iteration,
-                "timestamp": datetime.now().isoformat(),
-                "input_query": query,
-                "output_file": str(output_path.relative_to(self.alchemy_dir)),
-                "optimization_suggestion": optimization_suggestion,
-                "generation_stats": {
-                    "html_size": len(html_content)
-                }
-            }
+    async def _generate_screenshot(self,
+                                   html_path: Path,
+                                   screenshot_path: Path,
+                                   render_hints: Optional[Dict[str, bool]] = None) -> bool:
+        """使用Playwright生成HTML文件的截图
+        
+        页面通过文件URL加载，HTML中的相对路径资源可以正常解析
+        
+        Args:
+            html_path: HTML文件路径
+            screenshot_path: 截图保存路径
+            render_hints: 可选，渲染选项，见_screenshot_context
             
-            with open(output_dir / "generation_info.json", "w", encoding="utf-8") as f:
-                json.dump(generation_info, f, ensure_ascii=False, indent=2)
-
-
-            # 更新status.json
-            # 先检查status.json是否已存在，如果存在则读取现有内容
-            status_path = self.artifacts_dir / "status.json"
-            if status_path.exists():
-                try:
-                    with open(status_path, "r", encoding="utf-8") as f:
-                        status_info = json.load(f)
-                    # 更新必要字段，保留其他现有信息
-                    status_info.update({
-                        "updated_at": datetime.now().isoformat(),
-                        "latest_iteration": iteration,
-                    })
-                    # 确保原始查询存在
-                    if "original_query" not in status_info:
-                        status_info["original_query"] = query
-                except Exception as e:
-                    self.logger.warning(f"读取现有status.json失败: {str(e)}，将创建新文件")
-                    status_info = None
-            
-            # 如果status.json不存在或读取失败，则创建新的status_info
-            if not status_path.exists() or status_info is None:
-                status_info = {
-                    "artifact_id": f"artifact_{self.alchemy_id}",
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
-                    "latest_iteration": iteration,
-                    "original_query": query,
-                    "artifact": {
-                        "path": "artifact.html",
-                        "timestamp": datetime.now().isoformat()
-                    },
-                    "iterations": []
-                }
-                       
-            # 确保iterations字段存在
-            if "iterations" not in status_info:
-                status_info["iterations"] = []
-
-
-            # 更新迭代信息
-            iteration_info = {
-                "iteration": iteration,
-                "timestamp": datetime.now().isoformat(),
-                "path": str(work_base.relative_to(self.alchemy_dir)),
-                "query": query,
-                "type": "html",
-                "output": str(output_path.relative_to(self.alchemy_dir)),
-                "optimization_suggestion": optimization_suggestion
-            }
+        Returns:
+            bool: 截图是否成功
+        """
+        self.logger.debug("正在为HTML文件生成截图: %s", html_path)
+        
+        # 将路径转换为文件URL（as_uri会正确处理Windows盘符和需要转义的字符）
+        file_url = html_path.resolve().as_uri()
+        
+        return await self._capture_screenshot(
+            lambda page: page.goto(file_url, wait_until="load"),
+            screenshot_path,
+            render_hints
+        )
 
-            status_info["iterations"].append(iteration_info)
+    async def _generate_screenshot_from_html(self,
+                                             html_content: str,
+                                             screenshot_path: Path,
+                                             render_hints: Optional[Dict[str, bool]] = None) -> bool:
+        """使用Playwright为内存中的HTML内容生成截图
+        
+        直接通过set_content加载页面，不再经由文件URL重新读取磁盘上的HTML文件
+        
+        Args:
+            html_content: HTML内容
+            screenshot_path: 截图保存路径
+            render_hints: 可选，渲染选项，见_screenshot_context
             
-            with open(status_path, "w", encoding="utf-8") as f:
-                json.dump(status_info, f, ensure_ascii=False, indent=2)
-
-
-
-            # 截图
-            screenshot_path = output_dir / f"{artifact_name}_screenshot.png"
-            if await self._take_screenshot(html_content, screenshot_path):
-                self.logger.info(f"已保存截图: {screenshot_path}")
-            else:
-                self.logger.warning("截图失败，将跳过保存截图")
-
+        Returns:
+            bool: 截图是否成功
+        """
+        self.logger.debug("正在生成截图: %s", screenshot_path)
+        
+        return await self._capture_screenshot(
+            lambda page: page.set_content(html_content, wait_until="load"),
+            screenshot_path,
+            render_hints
+        )
 
-            return output_path
+    async def _load_with_retry(self, page, load_page, screenshot_path: Path) -> None:
+        """加载页面内容，超时后重试一次，再次超时则抛出异常
+        
+        Args:
+            page: 要加载内容的页面
+            load_page: 接收Page并返回加载页面内容的awaitable的函数
+            screenshot_path: 截图保存路径，仅用于日志
+        """
+        try:
+            await load_page(page)
+        except PlaywrightTimeoutError:
+            self.logger.warning("页面加载超时，正在重试: %s", screenshot_path)
+            await load_page(page)
 
-        except Exception as e:
-            self.logger.error(f"生成HTML并截图时发生错误: {str(e)}")
-            traceback.print_exc()
-            return None 
+    async def _route_lite_request(self, route) -> None:
+        """精简截图模式的请求路由：拦截不影响缩略图的资源，其余请求交给上下文级别的路由继续处理"""
+        if _should_block_request(route.request, self.screenshot_allow_hosts):
+            await route.abort()
+        else:
+            await route.fallback()
 
-    async def _generate_screenshot(self, html_path: Path, screenshot_path: Path) -> bool:
-        """使用Playwright生成HTML文件的截图
+    async def _capture_screenshot(self,
+                                  load_page,
+                                  screenshot_path: Path,
+                                  render_hints: Optional[Dict[str, bool]] = None) -> bool:
+        """在复用的浏览器中打开新页面，按load_page加载内容后截图
         
         Args:
-            html_path: HTML文件路径
+            load_page: 接收Page并返回加载页面内容的awaitable的函数
             screenshot_path: 截图保存路径
+            render_hints: 可选，渲染选项，见_screenshot_context
             
         Returns:
             bool: 截图是否成功
         """
         try:
-            self.logger.info(f"正在为HTML文件生成截图: {html_path}")
-            
-            # 将路径转换为文件URL
-            file_url = f"file://{html_path.absolute()}"
+            # 在复用的浏览器中创建独立的上下文和页面，截图后关闭上下文，浏览器留给后续截图复用
+            async with self._screenshot_context(render_hints) as context:
+                page = await context.new_page()
+                try:
+                    # 缩短默认超时，避免个别加载缓慢的页面拖住制品生成
+                    page.set_default_navigation_timeout(self.screenshot_nav_timeout_ms)
+                    page.set_default_timeout(self.screenshot_nav_timeout_ms)
+                    
+                    if ARTIFACT_SCREENSHOT_LITE:
+                        await page.route("**/*", self._route_lite_request)
+                    
+                    # 加载页面内容；本地内容在load事件时资源已加载完毕，不再等待networkidle的空闲判定
+                    await self._load_with_retry(page, load_page, screenshot_path)
+                    
+                    # 加载时已等待load事件，load晚于domcontentloaded触发，无需再单独等待domcontentloaded
+                    
+                    # 等待Web字体就绪后再截图，代替固定的等待时间
+                    try:
+                        await asyncio.wait_for(
+                            page.evaluate("() => document.fonts ? document.fonts.ready.then(() => true) : true"),
+                            timeout=FONTS_READY_TIMEOUT
+                        )
+                    except asyncio.TimeoutError:
+                        self.logger.warning("等待字体加载超时，直接截图: %s", screenshot_path)
+                    
+                    # 截图（图片格式由截图文件扩展名决定）
+                    image_format = "jpeg" if screenshot_path.suffix.lower() in (".jpg", ".jpeg") else "png"
+                    quality = {"quality": ARTIFACT_SCREENSHOT_QUALITY} if image_format == "jpeg" else {}
+                    image_bytes = await page.screenshot(full_page=False, type=image_format, **quality)
+                finally:
+                    # 页面用完即关闭
+                    await page.close()
             
-            async with async_playwright() as p:
-                # 启动浏览器
-                browser = await p.chromium.launch()
-                
-                # 创建新页面 - 修改视口大小为600x400，与gallery.html中的卡片比例相匹配
-                page = await browser.new_page(viewport={"width": 600, "height": 400})
-                
-                # 导航到HTML文件
-                await page.goto(file_url, wait_until="networkidle")
-                
-                # 等待页面内容加载完成
-                await page.wait_for_load_state("domcontentloaded")
-                
-                # 额外等待一段时间，确保所有内容都已渲染
-                await asyncio.sleep(1)
-                
-                # 截图
-                await page.screenshot(path=str(screenshot_path), full_page=False)
-                
-                # 关闭浏览器
-                await browser.close()
-                
-            self.logger.info(f"截图已保存: {screenshot_path}")
+            await asyncio.to_thread(screenshot_path.write_bytes, image_bytes)
+            self.logger.info("截图已保存: %s", screenshot_path)
             return True
             
-        except Exception as e:
-            self.logger.error(f"生成截图时发生错误: {str(e)}")
-            traceback.print_exc()
-            return False 
\ No newline at end of file
+        except Exception:
+            self.logger.exception("生成截图时发生错误: %s", screenshot_path)
+            return False
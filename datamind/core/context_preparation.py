@@ -1,9 +1,91 @@
+import hashlib
 import json
 import logging
+import os
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from docling.document_converter import DocumentConverter
+from ..utils.json_io import dump_json
+
+# 并发读取上下文文件的最大线程数
+MAX_READ_WORKERS = 8
+# 内容哈希摘要长度（字节），blake2b截断到与md5相同的16字节
+CONTENT_HASH_DIGEST_SIZE = 16
+# 文件内容缓存的最大条目数
+FILE_CACHE_MAX_ENTRIES = 256
+# 文件内容缓存中所有内容的总字符数上限
+FILE_CACHE_MAX_CHARS = 32 * 1024 * 1024
+# 单个文件内容超过该字符数时不放入缓存，避免大文档长期占用内存
+FILE_CACHE_MAX_ENTRY_CHARS = 2 * 1024 * 1024
+# 需要交由docling解析的文档类型，解析时加载版面模型，开销大，不放入线程池并发执行
+DOCLING_SUFFIXES = ('.docx', '.doc', '.pdf')
+
+# 进程内文件内容缓存：(绝对路径, st_mtime_ns, st_size) -> (文件内容, 内容哈希)
+# 多次生成使用相同的上下文文件时，未修改的文件无需重新读取、解析和计算哈希
+_file_content_cache: "OrderedDict[Tuple[str, int, int], Tuple[str, Optional[str]]]" = OrderedDict()
+_file_content_cache_lock = threading.Lock()
+# 缓存中所有文件内容的总字符数
+_file_content_cache_chars = 0
+
+
+def _get_cached_content(key: Tuple[str, int, int]) -> Optional[Tuple[str, Optional[str]]]:
+    """从缓存获取文件内容与哈希，命中时将条目移到末尾（LRU）"""
+    with _file_content_cache_lock:
+        cached = _file_content_cache.get(key)
+        if cached is not None:
+            _file_content_cache.move_to_end(key)
+        return cached
+
+
+def _put_cached_content(key: Tuple[str, int, int], value: Tuple[str, Optional[str]]) -> None:
+    """写入缓存，超出条目数或总字符数上限时淘汰最久未使用的条目；过大的内容不缓存"""
+    global _file_content_cache_chars
+    if len(value[0]) > FILE_CACHE_MAX_ENTRY_CHARS:
+        return
+    with _file_content_cache_lock:
+        previous = _file_content_cache.pop(key, None)
+        if previous is not None:
+            _file_content_cache_chars -= len(previous[0])
+        _file_content_cache[key] = value
+        _file_content_cache_chars += len(value[0])
+        while (len(_file_content_cache) > FILE_CACHE_MAX_ENTRIES
+               or _file_content_cache_chars > FILE_CACHE_MAX_CHARS):
+            _, (evicted_content, _) = _file_content_cache.popitem(last=False)
+            _file_content_cache_chars -= len(evicted_content)
+
+
+# 进程内共享的docling文档转换器，首次解析文档时创建；
+# 转换过程持有_docling_lock串行执行，同一时间只有一份模型在做推理
+_document_converter: Optional[DocumentConverter] = None
+_docling_lock = threading.Lock()
+
+
+def _convert_document(file_path: str) -> str:
+    """使用共享的DocumentConverter将Word/PDF文档转换为Markdown，多个调用方串行执行
+    
+    Args:
+        file_path: 文档路径
+        
+    Returns:
+        str: 转换得到的Markdown文本
+    """
+    global _document_converter
+    with _docling_lock:
+        if _document_converter is None:
+            _document_converter = DocumentConverter()
+        result = _document_converter.convert(file_path)
+        return result.document.export_to_markdown()
+
+
+def _new_hasher(algorithm: str = 'blake2b'):
+    """创建哈希对象，blake2b使用CONTENT_HASH_DIGEST_SIZE长度的摘要"""
+    if algorithm == 'blake2b':
+        return hashlib.blake2b(digest_size=CONTENT_HASH_DIGEST_SIZE)
+    return hashlib.new(algorithm)
 
 
 def prepare_context_files(context_files: List[str], 
@@ -53,7 +135,9 @@ def prepare_context_files(context_files: List[str],
             logger.error(f"提取文件路径时出错: {str(e)}")
     
     # 2. 保存去重后的文件路径列表到JSON文件
-    file_paths_list = list(all_file_paths)
+    # 按路径排序，保证各次迭代中上下文文件在提示词里的顺序稳定，
+    # 相同的上下文构成相同的提示词前缀，可以命中模型服务端的前缀缓存
+    file_paths_list = sorted(all_file_paths)
     file_paths_json = {
         "file_paths": file_paths_list,
         "total_count": len(file_paths_list),
@@ -62,38 +146,163 @@ def prepare_context_files(context_files: List[str],
     
     paths_json_file = context_dir / "file_paths.json"
     try:
-        with open(paths_json_file, 'w', encoding='utf-8') as f:
-            json.dump(file_paths_json, f, ensure_ascii=False, indent=2)
+        dump_json(paths_json_file, file_paths_json)
         logger.info(f"已保存文件路径列表到 {paths_json_file}")
     except Exception as e:
         logger.error(f"保存文件路径列表时出错: {str(e)}")
     
-    # 3. 加载所有文件路径中的文件内容
-    for file_path in all_file_paths:
-        path_obj = Path(file_path)
-        if not path_obj.exists():
+    # 3. 加载所有文件路径中的文件内容：纯文本文件使用线程池并发读取，文件I/O相互重叠；
+    #    Word/PDF文档由docling解析，开销大，在当前线程中逐个处理
+    def load_one(file_path: str):
+        # 只调用一次stat，同时用于判断文件是否存在和收集元数据；
+        # 缓存命中的路径上直接使用os函数处理字符串路径，不构造Path对象
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+        
+        # 文件未修改（路径、修改时间、大小均相同）时直接使用缓存的内容和哈希
+        cache_key = (os.path.abspath(file_path), file_stat.st_mtime_ns, file_stat.st_size)
+        cached = _get_cached_content(cache_key)
+        if cached is not None:
+            file_content, content_hash = cached
+        else:
+            # 读取文件内容（同一次读取中计算内容哈希）
+            file_content, content_hash = read_file_content_with_hash(file_path, logger=logger)
+            if not file_content:
+                return None
+            _put_cached_content(cache_key, (file_content, content_hash))
+        return Path(file_path), file_content, content_hash, file_stat
+    
+    text_paths = [p for p in file_paths_list if not p.lower().endswith(DOCLING_SUFFIXES)]
+    document_paths = [p for p in file_paths_list if p.lower().endswith(DOCLING_SUFFIXES)]
+    
+    loaded_by_path = {}
+    if text_paths:
+        with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(text_paths))) as pool:
+            loaded_by_path.update(zip(text_paths, pool.map(load_one, text_paths)))
+    for file_path in document_paths:
+        loaded_by_path[file_path] = load_one(file_path)
+    
+    # 按排序后的路径顺序收集结果
+    for file_path in file_paths_list:
+        loaded = loaded_by_path[file_path]
+        if loaded is None:
             continue
-            
-        rel_path = str(path_obj.relative_to(work_base)) if work_base in path_obj.parents else path_obj.name
+        path_obj, file_content, content_hash, file_stat = loaded
         
-        # 读取文件内容
-        file_content = read_file_content(file_path, logger=logger)
-        if file_content:
-            context_contents[rel_path] = file_content
-            
-            # 收集文件元数据
-            file_stat = path_obj.stat()
-            context_files_info[rel_path] = {
-                "file_name": path_obj.name,
-                "file_size": file_stat.st_size,
-                "last_modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                "absolute_path": str(path_obj.absolute()),
-                "relative_path": rel_path
-            }
+        # 直接尝试计算相对路径，避免逐级构造parents序列进行比较
+        try:
+            rel_path = str(path_obj.relative_to(work_base))
+        except ValueError:
+            rel_path = path_obj.name
+        context_contents[rel_path] = file_content
+        context_files_info[rel_path] = _build_file_info(path_obj, rel_path, file_stat, content_hash)
     
     return context_contents, context_files_info
 
 
+def _build_file_info(path_obj: Path, rel_path: str, file_stat: os.stat_result, content_hash: Optional[str]) -> Dict:
+    """根据已获取的stat结果构建文件元数据，不再额外访问文件系统
+    
+    Args:
+        path_obj: 文件路径
+        rel_path: 相对于工作目录的路径
+        file_stat: 文件的stat结果
+        content_hash: 文件内容哈希
+        
+    Returns:
+        Dict: 文件元数据
+    """
+    return {
+        "file_name": path_obj.name,
+        "file_size": file_stat.st_size,
+        "last_modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
+        "absolute_path": str(path_obj.absolute()),
+        "relative_path": rel_path,
+        "content_hash": content_hash
+    }
+
+
+def compute_file_hash(file_path: str, algorithm: str = 'blake2b', logger: Optional[logging.Logger] = None) -> Optional[str]:
+    """以二进制流方式计算文件内容哈希，不需要先把文件解码为字符串
+    
+    Args:
+        file_path: 文件路径
+        algorithm: 哈希算法名称，默认blake2b
+        logger: 可选，日志记录器实例
+        
+    Returns:
+        Optional[str]: 十六进制哈希值，如果读取失败则返回None
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+        
+    try:
+        with open(file_path, 'rb') as f:
+            # Python 3.11+ 直接在C层按块读取并计算哈希
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, lambda: _new_hasher(algorithm)).hexdigest()
+            
+            hasher = _new_hasher(algorithm)
+            while block := f.read(1 << 20):
+                hasher.update(block)
+            return hasher.hexdigest()
+    except Exception as e:
+        logger.error(f"计算文件 {file_path} 的哈希时发生错误: {str(e)}")
+        return None
+
+
+def read_file_content_with_hash(file_path: str, logger: Optional[logging.Logger] = None) -> Tuple[Optional[str], Optional[str]]:
+    """读取文件内容并计算内容哈希
+    
+    文本文件只读取一次原始字节，哈希与解码共用同一份数据；
+    Word/PDF文档仍交由docling解析，哈希单独按二进制流计算。
+    
+    Args:
+        file_path: 文件路径
+        logger: 可选，日志记录器实例
+        
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (文件内容, 内容哈希)，读取失败时对应项为None
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+        
+    path = Path(file_path)
+    if path.suffix.lower() in DOCLING_SUFFIXES:
+        content = read_file_content(file_path, logger=logger)
+        if content is None:
+            return None, None
+        return content, compute_file_hash(file_path, logger=logger)
+    
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        logger.warning(f"文件不存在: {file_path}")
+        return None, None
+    except Exception as e:
+        logger.error(f"读取文件 {file_path} 时发生错误: {str(e)}")
+        return None, None
+    
+    content_hash = hashlib.blake2b(raw, digest_size=CONTENT_HASH_DIGEST_SIZE).hexdigest()
+    
+    try:
+        content = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        # 如果UTF-8解码失败，使用latin-1
+        logger.warning(f"UTF-8解码失败，尝试使用latin-1解码: {file_path}")
+        content = raw.decode('latin-1')
+    else:
+        logger.info(f"成功读取文件: {file_path}")
+    
+    # 与文本模式读取保持一致：统一换行符
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    return content, content_hash
+
+
 def read_file_content(file_path: str, encoding: str = 'utf-8', logger: Optional[logging.Logger] = None) -> Optional[str]:
     """读取文件内容
     
@@ -121,9 +330,7 @@ def read_file_content(file_path: str, encoding: str = 'utf-8', logger: Optional[
     if suffix in ['.docx', '.doc']:
         try:
             logger.info(f"使用DocumentConverter处理Word文档: {file_path}")
-            converter = DocumentConverter()
-            result = converter.convert(str(path))
-            content = result.document.export_to_markdown()
+            content = _convert_document(str(path))
             logger.info(f"成功读取Word文档: {file_path}")
             return content
         except Exception as e:
@@ -134,9 +341,7 @@ def read_file_content(file_path: str, encoding: str = 'utf-8', logger: Optional[
     elif suffix in ['.pdf']:
         try:
             logger.info(f"使用DocumentConverter处理PDF文档: {file_path}")
-            converter = DocumentConverter()
-            result = converter.convert(str(path))
-            content = result.document.export_to_markdown()
+            content = _convert_document(str(path))
             logger.info(f"成功读取PDF文档: {file_path}")
             return content
         except Exception as e:
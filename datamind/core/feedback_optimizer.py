@@ -2,9 +2,9 @@
 反馈优化工作流模块，用于处理用户反馈并生成新的查询
 """
 from typing import Optional
-import json
 from pathlib import Path
 import logging
+from ..utils.json_io import load_json
 
 logger = logging.getLogger(__name__)
 
@@ -47,8 +47,7 @@ class FeedbackOptimizer:
                 self.logger.warning(f"未找到状态文件: {status_path}")
                 return None
 
-            with open(status_path, 'r', encoding='utf-8') as f:
-                status_info = json.load(f)
+            status_info = load_json(status_path)
 
             iterations = status_info.get('iterations', [])
             if not iterations:
@@ -150,6 +150,7 @@ class ReasoningLLMEngine:
         Yields:
             str: 模型响应的流式内容片段
         """
+        stream = None
         try:
             formatted_messages = self.get_formatted_messages()
             if not formatted_messages:
@@ -234,6 +235,10 @@ class ReasoningLLMEngine:
         except Exception as e:
             self.logger.error(f"获取流式响应失败: {str(e)}")
             return
+        finally:
+            # 调用方提前结束迭代时关闭底层HTTP流，服务端随之停止生成
+            if stream is not None and hasattr(stream, "close"):
+                await stream.close()
 
     def get_chat_history(self) -> List[Dict[str, Any]]:
         """
@@ -9,6 +9,13 @@ from ..config.settings import DEFAULT_EMBEDDING_MODEL, DEFAULT_DB_PATH, SEARCH_T
 from .planner import SearchPlanner
 from ..llms.model_manager import ModelManager, ModelConfig
 
+# parse_query使用的查询格式（按匹配顺序排列）及其预编译正则
+_QUERY_PATTERNS = (
+    ('text', re.compile(r'^(?!file:|date:).*')),
+    ('file', re.compile(r'file:(\w+)')),
+    ('date', re.compile(r'date:(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})'))
+)
+
 class SearchEngine:
     """统一搜索引擎，支持结构化查询和向量相似度搜索"""
     
@@ -182,14 +189,8 @@ class SearchEngine:
         Returns:
             Dict: 包含查询类型和内容的字典
         """
-        patterns = {
-            'text': r'^(?!file:|date:).*',
-            'file': r'file:(\w+)',
-            'date': r'date:(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})'
-        }
-        
-        for query_type, pattern in patterns.items():
-            if match := re.match(pattern, query):
+        for query_type, pattern in _QUERY_PATTERNS:
+            if match := pattern.match(query):
                 return {
                     'type': query_type,
                     'content': match.groups()[0] if match.groups() else query
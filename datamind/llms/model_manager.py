@@ -167,8 +167,8 @@ class ModelManager:
                     return None
                     
                 self.logger.debug(f"发送请求到API，模型: {model_name}")
-                self.logger.debug(f"请求消息: {messages}")
-                self.logger.debug(f"额外参数: {kwargs}")
+                self.logger.debug("请求消息: %s", messages)
+                self.logger.debug("额外参数: %s", kwargs)
                 
                 is_stream = kwargs.get('stream', False)
                 max_retries = 3 if not is_stream else 1  # 流式模式下不重试
@@ -188,7 +188,7 @@ class ModelManager:
                         if is_stream:
                             return response  # 返回流式响应
                         else:
-                            self.logger.debug(f"API原始响应内容: {response}")
+                            self.logger.debug("API原始响应内容: %s", response)
                             return response
                         
                     except Exception as e:
@@ -247,8 +247,8 @@ class ModelManager:
                 return None
                 
             self.logger.debug(f"发送请求到API，模型: {model_name}")
-            self.logger.debug(f"请求消息: {messages}")
-            self.logger.debug(f"额外参数: {kwargs}")
+            self.logger.debug("请求消息: %s", messages)
+            self.logger.debug("额外参数: %s", kwargs)
             
             is_stream = kwargs.get('stream', False)
             max_retries = 3 if not is_stream else 1  # 流式模式下不重试
@@ -268,7 +268,7 @@ class ModelManager:
                     if is_stream:
                         return response  # 返回流式响应
                     else:
-                        self.logger.debug(f"API原始响应内容: {response}")
+                        self.logger.debug("API原始响应内容: %s", response)
                         return response
                     
                 except Exception as e:
@@ -1,3 +1,8 @@
+from functools import lru_cache
+
+
+# 提示词模板在运行期间不会变化，读取一次后缓存，避免每次生成都重新读取磁盘
+@lru_cache(maxsize=64)
 def load_prompt(prompt):
     import os
     # 获取当前模块的绝对路径
@@ -5,6 +5,7 @@ from typing import List, Dict, Optional
 import shutil
 from datetime import datetime
 import pandas as pd
+from ..utils.json_io import load_json
 
 class AlchemyManager:
     """数据炼丹任务管理器，用于管理多个alchemy任务实例"""
@@ -79,8 +80,7 @@ class AlchemyManager:
             
             # 读取任务状态
             try:
-                with open(status_file, 'r', encoding='utf-8') as f:
-                    status_data = json.load(f)
+                status_data = load_json(status_file)
                 
                 # 提取关键信息
                 latest_iteration = status_data.get("latest_iteration", 0)
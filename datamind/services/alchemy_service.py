@@ -1,4 +1,6 @@
+import asyncio
 import json
+import os
 import time
 import logging
 import shutil
@@ -11,6 +13,7 @@ from ..core.processor import DataProcessor, FileCache
 from ..core.parser import IntentParser
 from ..core.feedback_optimizer import FeedbackOptimizer
 from ..core.artifact import ArtifactGenerator
+from ..utils.json_io import dump_json, load_json
 from ..llms.model_manager import ModelManager, ModelConfig
 from ..config.settings import (
     DEFAULT_LLM_API_KEY,
@@ -199,13 +202,19 @@ class DataMindAlchemy:
 
     def _get_next_iteration(self) -> int:
         """获取下一个迭代版本号"""
-        if not self.iterations_dir.exists():
+        # 用os.scandir直接遍历目录项名称，不为每个子目录构造Path对象
+        try:
+            entries = os.scandir(self.iterations_dir)
+        except FileNotFoundError:
             return 1
             
-        existing_iterations = [int(v.name.split('iter')[-1]) 
-                             for v in self.iterations_dir.glob("iter*") 
-                             if v.name.startswith('iter')]
-        return max(existing_iterations, default=0) + 1
+        latest_iteration = 0
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('iter') and name[4:].isdigit():
+                    latest_iteration = max(latest_iteration, int(name[4:]))
+        return latest_iteration + 1
 
     async def process(
         self,
@@ -520,11 +529,10 @@ class DataMindAlchemy:
             status_path = self.alchemy_dir / "status.json"
             if status_path.exists():
                 try:
-                    with open(status_path, "r", encoding="utf-8") as f:
-                        status_info = json.load(f)
-                        if 'latest_iteration' in status_info:
-                            previous_iteration = status_info['latest_iteration']
-                            self.logger.info(f"从status.json获取到上一次迭代号: {previous_iteration}")
+                    status_info = load_json(status_path)
+                    if 'latest_iteration' in status_info:
+                        previous_iteration = status_info['latest_iteration']
+                        self.logger.info(f"从status.json获取到上一次迭代号: {previous_iteration}")
                 except Exception as e:
                     self.logger.error(f"读取status.json失败: {str(e)}")
             
@@ -686,6 +694,9 @@ class DataMindAlchemy:
             'components': self.components
         }
         
+        artifact_generator = self.components.get('artifact_generator') if hasattr(self, 'components') else None
+        warmup_task = None
+        
         try:
             # 在迭代之前更新状态信息
             status_info = {
@@ -698,8 +709,7 @@ class DataMindAlchemy:
             
             status_path = self.alchemy_dir / "status.json"
             if status_path.exists():
-                with open(status_path, "r", encoding="utf-8") as f:
-                    status_info = json.load(f)
+                status_info = load_json(status_path)
             
             # 更新迭代信息
             iteration_info = {
@@ -715,8 +725,7 @@ class DataMindAlchemy:
             status_info["latest_iteration"] = self._get_next_iteration() - 1  # 当前迭代号
             status_info["updated_at"] = datetime.now().isoformat()
             
-            with open(status_path, "w", encoding="utf-8") as f:
-                json.dump(status_info, f, ensure_ascii=False, indent=2)
+            dump_json(status_path, status_info)
             
             # 设置当前步骤
             self._current_step = "parse_intent"
@@ -776,6 +785,8 @@ class DataMindAlchemy:
 
             # 为搜索结果生成artifact
             if search_results and search_results.get('saved_files', {}).get('final_results'):
+                # 确定要生成制品后，在生成HTML的同时预先启动截图用浏览器，截图时不再等待浏览器冷启动
+                warmup_task = asyncio.create_task(self.components['artifact_generator'].warmup())
                 search_artifact_path = await self.components['artifact_generator'].generate_artifact(
                     search_results_files=[search_results['saved_files']['final_results']],
                     output_name='artifact',
@@ -786,15 +797,13 @@ class DataMindAlchemy:
                     
                     # 更新状态文件中的制品信息
                     if status_path.exists():
-                        with open(status_path, "r", encoding="utf-8") as f:
-                            status_info = json.load(f)
+                        status_info = load_json(status_path)
                         
                         # 更新最新迭代的制品信息
                         if status_info.get('iterations'):
                             status_info['iterations'][-1]['artifacts'] = results['results']['artifacts']
                             
-                        with open(status_path, "w", encoding="utf-8") as f:
-                            json.dump(status_info, f, ensure_ascii=False, indent=2)
+                        dump_json(status_path, status_info)
                     
                     # 发布制品生成事件
                     await self.event_bus.publish(
@@ -873,16 +882,14 @@ class DataMindAlchemy:
                             
                             # 更新状态文件中的优化建议信息
                             if status_path.exists():
-                                with open(status_path, "r", encoding="utf-8") as f:
-                                    status_info = json.load(f)
+                                status_info = load_json(status_path)
                                 
                                 # 更新最新迭代的优化建议信息
                                 if status_info.get('iterations'):
                                     status_info['iterations'][-1]['optimization_suggestions'] = results['results']['optimization_suggestions']
                                     status_info['iterations'][-1]['artifacts'] = results['results']['artifacts']
                                     
-                                with open(status_path, "w", encoding="utf-8") as f:
-                                    json.dump(status_info, f, ensure_ascii=False, indent=2)
+                                dump_json(status_path, status_info)
                         else:
                             self.logger.warning(f"优化建议处理失败: {optimization_result['message']}")
             
@@ -913,6 +920,12 @@ class DataMindAlchemy:
             )
             
             return results
+        finally:
+            # 释放制品生成器复用的浏览器实例（先等待预热完成，避免关闭后预热任务又启动浏览器）
+            if warmup_task is not None:
+                await warmup_task
+            if artifact_generator is not None:
+                await artifact_generator.aclose()
 
     # 添加事件相关方法
     def subscribe(self, event_type: AlchemyEventType, callback: Callable):
@@ -941,9 +954,7 @@ class DataMindAlchemy:
         status_path = self.alchemy_dir / "status.json"
         if status_path.exists():
             try:
-                with open(status_path, "r", encoding="utf-8") as f:
-                    status_info = json.load(f)
-                    return status_info
+                return load_json(status_path)
             except Exception as e:
                 self.logger.warning(f"加载状态信息失败: {str(e)}")
         return None 
@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时回退到标准库json
+    orjson = None
+
+
+def dumps_json(data: Any) -> bytes:
+    """将对象序列化为UTF-8编码的JSON字节串（2空格缩进，保留非ASCII字符）
+
+    Args:
+        data: 要序列化的对象
+
+    Returns:
+        bytes: JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def write_bytes_atomic(path: Union[str, Path], data: bytes) -> None:
+    """原子地写入文件：先写入同目录下的临时文件，再用os.replace替换目标文件
+
+    读取方要么看到旧内容，要么看到完整的新内容，不会读到写了一半的文件
+
+    Args:
+        path: 目标文件路径
+        data: 要写入的字节内容
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def link_or_copy_atomic(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """将src原子地发布为dst：优先创建硬链接，跨文件系统等不支持时回退为复制
+
+    先在dst同目录下建立临时链接/副本，再用os.replace替换目标文件。
+    dst与src可能共享同一inode，之后只能整体替换dst，不能原地改写
+
+    Args:
+        src: 源文件路径
+        dst: 目标文件路径
+    """
+    dst = Path(dst)
+    tmp_path = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def dump_json(path: Union[str, Path], data: Any) -> None:
+    """将对象以JSON格式原子地写入文件
+
+    Args:
+        path: 目标文件路径
+        data: 要写入的对象
+    """
+    write_bytes_atomic(path, dumps_json(data))
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """读取JSON文件
+
+    Args:
+        path: JSON文件路径
+
+    Returns:
+        Any: 解析后的对象
+    """
+    raw = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))